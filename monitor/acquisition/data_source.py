@@ -0,0 +1,159 @@
+"""
+Common base for EEG data sources.
+Shared buffering, recording and data-access code for the serial and
+simulated readers.
+"""
+
+import io
+import time
+import threading
+import numpy as np
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from data.ring_buffer import RingBuffer
+
+class DataSource(QObject):
+    """Base class for EEG data sources
+
+    Owns the pieces every source needs - the sample/timestamp ring
+    buffers, the recording file lifecycle and thread-safe data access -
+    so SerialReader and SimulatedReader only implement how samples
+    actually arrive. Keeping this shared means a buffering or recording
+    improvement lands in both paths at once instead of drifting apart.
+    """
+
+    # Signals (shared contract for all sources)
+    data_updated = pyqtSignal()  # Emitted when new data is available
+    connection_changed = pyqtSignal(bool, str)  # Connected status, message
+
+    def __init__(self, settings, data_manager=None):
+        super().__init__()
+
+        # Store settings
+        self.settings = settings
+
+        # Data manager used to create recording files in the recordings
+        # directory; without one, recordings land in the working directory
+        self.data_manager = data_manager
+
+        # Data buffers - one for EEG, one for timestamps.
+        # Samples are stored unboxed (int16 matches the wire/.dat format)
+        # in preallocated ring buffers instead of deques of Python objects.
+        self.eeg_buffer = RingBuffer(settings.spectrogram_buffer_size, dtype=np.int16)
+        self.time_buffer = RingBuffer(settings.spectrogram_buffer_size, dtype=np.float64)
+
+        # Buffers may be filled from a producer thread while the GUI
+        # thread reads them; uncontended acquisition is cheap enough
+        # that single-threaded sources just pay a few ns per block
+        self._buffer_lock = threading.Lock()
+
+        # Connection state
+        self.connected = False
+
+        # Recording state
+        self.recording = False
+        self.output_file = None
+        self.start_time = None
+        self.output_filename = None
+        self._last_flush = 0
+
+        # Timestamp tracking (monotonic: immune to NTP/DST wall-clock
+        # jumps, and integer ns math is cheap)
+        self.last_timestamp = time.monotonic_ns()
+
+    def start_recording(self):
+        """Start recording data to a file"""
+        if not self.connected:
+            return False, "Not connected. Cannot record."
+
+        try:
+            # DataManager owns filename generation and the buffered open;
+            # writes are flushed periodically from the acquisition path
+            if self.data_manager is not None:
+                self.output_file, self.output_filename = \
+                    self.data_manager.prepare_recording_file()
+            else:
+                timestamp = time.strftime("%Y%m%d-%H%M%S")
+                self.output_filename = f"EEG_RECORDING_{timestamp}.dat"
+                raw = open(self.output_filename, 'wb', buffering=0)
+                self.output_file = io.BufferedWriter(raw, buffer_size=64 * 1024)
+            self.recording = True
+            self.start_time = time.time()
+            self._last_flush = time.monotonic_ns()
+            return True, f"Recording to {self.output_filename}"
+        except Exception as e:
+            return False, f"Error starting recording: {e}"
+
+    def stop_recording(self):
+        """Stop recording data"""
+        if not self.recording:
+            return False, "Not recording"
+
+        if self.output_file:
+            self.output_file.close()
+            duration = time.time() - self.start_time
+            self.output_file = None
+            self.recording = False
+            return True, f"Saved {self.output_filename} ({duration:.1f} sec)"
+
+        self.recording = False
+        return False, "Recording stopped but no file was open"
+
+    def toggle_recording(self):
+        """Toggle recording state"""
+        if not self.recording:
+            return self.start_recording()
+        else:
+            return self.stop_recording()
+
+    def get_data(self):
+        """Return the current data buffers
+
+        Returns:
+            tuple of (eeg_data, time_data, total_samples): numpy arrays
+            of the samples oldest first, plus the buffer's monotonic
+            sample count taken under the same lock - so the count is
+            guaranteed to describe exactly the returned snapshot, not a
+            buffer a producer thread has since extended. The arrays are
+            safe to keep: anything still viewing the live ring storage
+            is copied before release.
+        """
+        with self._buffer_lock:
+            total_samples = self.eeg_buffer.total_samples
+            eeg = self.eeg_buffer.to_array()
+            times = self.time_buffer.to_array()
+            # to_array returns views of the live storage whenever the
+            # samples are in order; detach them before leaving the lock
+            if not eeg.flags.owndata:
+                eeg = eeg.copy()
+            if not times.flags.owndata:
+                times = times.copy()
+        return eeg, times, total_samples
+
+    def get_connection_status(self):
+        """Get the current connection status and information"""
+        if self.connected:
+            return True, "Active"
+        return False, "Not connected"
+
+    def get_available_ports(self):
+        """List selectable ports for this source
+
+        Sources without hardware ports (like the simulator) have
+        nothing to offer; SerialReader overrides this with the real
+        enumeration.
+
+        Returns:
+            List of port info dicts (empty by default)
+        """
+        return []
+
+    def test_connection(self):
+        """Check that the source is delivering data
+
+        Returns:
+            tuple of (success, message)
+        """
+        if self.connected:
+            return True, "Source is active."
+        return False, "Not connected."
@@ -3,79 +3,94 @@ Serial data acquisition for EEG Monitor.
 Handles reading and parsing data from the EEG device.
 """
 
+import os
+import sys
 import time
+import threading
+import numpy as np
 import serial
 import serial.tools.list_ports
-from collections import deque
-from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtCore import QTimer
 
-class SerialReader(QObject):
+from acquisition.data_source import DataSource
+
+# Raw os.read on the port fd is only available on POSIX ttys
+_IS_POSIX = os.name == 'posix'
+
+class SerialReader(DataSource):
     """Handles serial communication with the EEG device"""
-    
-    # Signals
-    data_updated = pyqtSignal()  # Emitted when new data is available
-    connection_changed = pyqtSignal(bool, str)  # Connected status, message
-    
-    def __init__(self, settings):
-        super().__init__()
-        
-        # Store settings
-        self.settings = settings
-        
-        # Data buffers - one for EEG, one for timestamps
-        self.eeg_buffer = deque(maxlen=settings.spectrogram_buffer_size)
-        self.time_buffer = deque(maxlen=settings.spectrogram_buffer_size)
-        
+
+    def __init__(self, settings, data_manager=None):
+        super().__init__(settings, data_manager)
+
         # Serial connection
         self.ser = None
-        self.connected = False
-        
-        # Recording state
-        self.recording = False
-        self.output_file = None
-        self.start_time = None
-        self.output_filename = None
-        
-        # Initialize timestamp tracking
-        self.last_timestamp = time.time()
-        
-        # Setup data reading timer
-        self.data_timer = QTimer()
-        self.data_timer.timeout.connect(self.read_serial_data)
-        # Run at 4x the update rate to ensure smooth display
-        self.data_timer.start(int(settings.update_interval / 4))
+
+        # Cached port enumeration (comports() hits the OS every call)
+        self._ports_cache = None
+        self._ports_cache_ts = 0.0
+
+        # Acquisition runs on its own thread so GUI stalls can't starve
+        # the serial buffer; the buffers are shared with the GUI thread
+        # and guarded by the base class's lock.
+        self._reader_thread = None
+        self._stop_reading = threading.Event()
+
+        # Partial sample carried between reads: draining in_waiting can
+        # leave an odd byte count, and half a sample must wait for its
+        # other half instead of shifting the int16 framing
+        self._rx_residual = b''
+
+        # Coalesce data_updated emissions: the reader thread only sets a
+        # dirty flag, and this timer (on the GUI thread) emits at most
+        # once per display interval regardless of burst rate
+        self._dirty = False
+        self._emit_timer = QTimer()
+        self._emit_timer.timeout.connect(self._maybe_emit)
+        self._emit_timer.start(settings.update_interval)
     
     def get_available_ports(self):
         """Get a list of available serial ports"""
+        # Enumerating ports is an OS scan that can take tens of ms, so
+        # reuse a recent result rather than scanning on every call
+        if (self._ports_cache is not None
+                and time.monotonic() - self._ports_cache_ts < 1.0):
+            return self._ports_cache
+
         ports = serial.tools.list_ports.comports()
         port_list = []
-        
+        bt_name = self.settings.bluetooth_device_name
+
         # Create a list of port info dictionaries
         for port in ports:
             port_info = {
-                "device": port.device, 
+                "device": port.device,
                 "description": port.description,
-                "is_bluetooth": "Bluetooth" in port.description or self.settings.bluetooth_device_name in port.device
+                "is_bluetooth": "Bluetooth" in port.description or bt_name in port.device
             }
-            
+
             # Put Bluetooth EEG device at the top if it's available
-            if self.settings.bluetooth_device_name in port.device:
+            if bt_name in port.device:
                 port_list.insert(0, port_info)
             else:
                 port_list.append(port_info)
-                
+
+        self._ports_cache = port_list
+        self._ports_cache_ts = time.monotonic()
         return port_list
-    
+
+    def _invalidate_ports_cache(self):
+        """Drop the cached port list so the next query rescans"""
+        self._ports_cache = None
+
     def find_brain_device(self):
         """Attempt to find the EEG device"""
-        ports = serial.tools.list_ports.comports()
-        
         # First, try to find the Bluetooth device by name
         if self.settings.use_bluetooth:
-            for port in ports:
-                if self.settings.bluetooth_device_name in port.device:
-                    return port.device
-        
+            for port in self.get_available_ports():
+                if self.settings.bluetooth_device_name in port["device"]:
+                    return port["device"]
+
         # Otherwise use the default serial port from settings
         return self.settings.serial_port
     
@@ -85,22 +100,37 @@ class SerialReader(QObject):
         if port is None or port == "auto":
             port = self.find_brain_device()
         
-        # Close existing connection if open
+        # Close existing connection if open, stopping its acquisition
+        # thread first - otherwise the old thread survives the port
+        # close, latches onto the newly opened port and reads it
+        # concurrently with the new thread
         if self.ser and self.ser.is_open:
+            self._stop_reader()
             self.ser.close()
             self.connected = False
         
         try:
-            # Open new connection
-            self.ser = serial.Serial(port, self.settings.baud_rate)
+            # Open new connection. The short timeout bounds the blocking
+            # read in the acquisition loop so the stop flag is honored
+            # promptly on shutdown.
+            self.ser = serial.Serial(port, self.settings.baud_rate, timeout=0.05)
             self.settings.serial_port = port  # Save the current port
             self.connected = True
+
+            # Ask the USB-serial driver to deliver bytes immediately
+            self._enable_low_latency()
             
             # Clear buffers for fresh start
-            self.eeg_buffer.clear()
-            self.time_buffer.clear()
-            self.last_timestamp = time.time()
-            
+            with self._buffer_lock:
+                self.eeg_buffer.clear()
+                self.time_buffer.clear()
+            self._rx_residual = b''
+            self.last_timestamp = time.monotonic_ns()
+
+            # Start the acquisition thread
+            self._start_reader()
+
+            self._invalidate_ports_cache()
             self.connection_changed.emit(True, f"Connected to {port}")
             return True, f"Connected to {port}"
             
@@ -109,58 +139,97 @@ class SerialReader(QObject):
             self.connection_changed.emit(False, f"Error connecting: {str(e)}")
             return False, f"Error connecting: {str(e)}"
     
+    def _enable_low_latency(self):
+        """Put the USB-serial port into low-latency mode if possible
+
+        FTDI-style adapters buffer received bytes for up to 16 ms by
+        default, which bursts a 500 Hz EEG stream into ~16 ms clumps.
+        Setting the ASYNC_LOW_LATENCY flag (Linux) or writing to the
+        sysfs latency_timer makes the driver hand bytes over as soon
+        as they arrive. Unsupported platforms just skip this.
+        """
+        if sys.platform.startswith('linux'):
+            try:
+                import fcntl
+                import struct
+                TIOCGSERIAL = 0x541E
+                TIOCSSERIAL = 0x541F
+                ASYNC_LOW_LATENCY = 1 << 13
+
+                buf = bytearray(64)
+                fcntl.ioctl(self.ser.fd, TIOCGSERIAL, buf)
+                # 'flags' is the 5th int field of struct serial_struct
+                flags = struct.unpack_from('i', buf, 4 * 4)[0]
+                struct.pack_into('i', buf, 4 * 4, flags | ASYNC_LOW_LATENCY)
+                fcntl.ioctl(self.ser.fd, TIOCSSERIAL, buf)
+                return
+            except Exception:
+                pass
+
+            # Fallback: write the FTDI latency timer directly via sysfs
+            try:
+                tty = os.path.basename(self.ser.port)
+                latency_path = f"/sys/bus/usb-serial/devices/{tty}/latency_timer"
+                with open(latency_path, 'w') as f:
+                    f.write('1')
+            except Exception:
+                pass
+        elif sys.platform == 'darwin':
+            try:
+                import fcntl
+                import struct
+                # IOSSDATALAT: set read latency on macOS serial drivers
+                IOSSDATALAT = 0x40045402
+                fcntl.ioctl(self.ser.fd, IOSSDATALAT, struct.pack('I', 1))
+            except Exception:
+                pass
+
+    def _start_reader(self):
+        """Start the background acquisition thread"""
+        self._stop_reading.clear()
+        self._reader_thread = threading.Thread(
+            target=self._read_loop, name="eeg-serial-reader", daemon=True
+        )
+        self._reader_thread.start()
+
+    def _stop_reader(self):
+        """Stop the background acquisition thread"""
+        self._stop_reading.set()
+        if self._reader_thread and self._reader_thread.is_alive():
+            if self._reader_thread is not threading.current_thread():
+                self._reader_thread.join(timeout=1.0)
+        self._reader_thread = None
+
+    def _read_loop(self):
+        """Acquisition loop run on the reader thread
+
+        read_serial_data blocks in the kernel until data arrives (or a
+        short timeout lets us re-check the stop flag), so idle costs no
+        timer wakeups and samples are picked up the moment they land.
+        """
+        while not self._stop_reading.is_set():
+            if not self.ser or not self.ser.is_open:
+                break
+            self.read_serial_data()
+
     def disconnect(self):
         """Disconnect from the serial port"""
         if self.ser and self.ser.is_open:
             # Stop recording if active
             if self.recording:
                 self.stop_recording()
-                
+
+            # Stop the acquisition thread before closing the port
+            self._stop_reader()
+
             # Close the serial port
             self.ser.close()
             self.connected = False
+            self._invalidate_ports_cache()
             self.connection_changed.emit(False, f"Disconnected from {self.settings.serial_port}")
             return True
         return False
     
-    def start_recording(self):
-        """Start recording data to a file"""
-        if not self.connected:
-            return False, "Not connected to any port. Cannot record."
-            
-        timestamp = time.strftime("%Y%m%d-%H%M%S")
-        self.output_filename = f"EEG_RECORDING_{timestamp}.dat"
-        
-        try:
-            self.output_file = open(self.output_filename, 'wb')
-            self.recording = True
-            self.start_time = time.time()
-            return True, f"Recording to {self.output_filename}"
-        except Exception as e:
-            return False, f"Error starting recording: {e}"
-    
-    def stop_recording(self):
-        """Stop recording data"""
-        if not self.recording:
-            return False, "Not recording"
-            
-        if self.output_file:
-            self.output_file.close()
-            duration = time.time() - self.start_time
-            self.output_file = None
-            self.recording = False
-            return True, f"Saved {self.output_filename} ({duration:.1f} sec)"
-        
-        self.recording = False
-        return False, "Recording stopped but no file was open"
-    
-    def toggle_recording(self):
-        """Toggle recording state"""
-        if not self.recording:
-            return self.start_recording()
-        else:
-            return self.stop_recording()
-    
     def test_connection(self):
         """Test the serial connection by reading a few bytes"""
         if not self.ser or not self.ser.is_open:
@@ -179,64 +248,91 @@ class SerialReader(QObject):
             return False, f"Connection test error: {str(e)}"
     
     def read_serial_data(self):
-        """Read data from the serial port and update the buffer"""
-        # Read all available data from serial port
-        if not self.ser or not self.ser.is_open:
+        """Wait for serial data, then drain and buffer what arrived"""
+        ser = self.ser
+        if not ser or not ser.is_open:
             return
-            
+
         try:
+            # Block in the kernel until at least one sample arrives or
+            # the port timeout elapses - the instant-wakeup replacement
+            # for the old in_waiting polling
+            data = ser.read(2)
+            if not data:
+                return
+
+            # Drain whatever accumulated behind the first sample in one
+            # further call. On POSIX, in_waiting already told us the
+            # bytes are there, so a raw os.read skips PySerial's
+            # timeout machinery.
+            bytes_waiting = ser.in_waiting
+            if bytes_waiting:
+                if _IS_POSIX:
+                    data += os.read(ser.fileno(), bytes_waiting)
+                else:
+                    data += ser.read(bytes_waiting)
+
+            # Samples are 2 bytes, but the reads above can deliver an
+            # odd count (short first read, odd drain). Prepend whatever
+            # was left over last time and carry any trailing half-sample
+            # forward so the int16 framing never shifts.
+            if self._rx_residual:
+                data = self._rx_residual + data
+
             # Calculate time elapsed since last read for accurate timestamps
-            current_time = time.time()
-            time_elapsed = current_time - self.last_timestamp
-            self.last_timestamp = current_time
-            
-            bytes_to_read = self.ser.in_waiting
-            if bytes_to_read >= 2:  # Each sample is 2 bytes
-                # Read data in chunks of 2 bytes
-                num_samples = bytes_to_read // 2
-                
+            now_ns = time.monotonic_ns()
+            time_elapsed = (now_ns - self.last_timestamp) * 1e-9
+            self.last_timestamp = now_ns
+
+            num_samples = len(data) // 2
+            aligned = num_samples * 2
+            self._rx_residual = data[aligned:]
+            data = data[:aligned]
+            if num_samples > 0:
                 # Create a time vector for these samples
                 # (distribute samples evenly over the elapsed time)
-                if len(self.time_buffer) > 0:
-                    last_time = self.time_buffer[-1]
-                else:
-                    last_time = 0
-                    
-                sample_times = [
-                    last_time + (time_elapsed * (i + 1) / num_samples)
-                    for i in range(num_samples)
-                ]
-                
-                data_received = False
-                for i in range(num_samples):
-                    data = self.ser.read(2)
-                    if len(data) == 2:
-                        # Convert to integer (16-bit signed)
-                        try:
-                            value = int.from_bytes(data, byteorder='little', signed=True)
-                            
-                            # Add to buffers
-                            self.eeg_buffer.append(value)
-                            self.time_buffer.append(sample_times[i])
-                            data_received = True
-                            
-                            # Save to file if recording
-                            if self.recording and self.output_file:
-                                self.output_file.write(data)
-                        except Exception as e:
-                            print(f"Error processing data byte: {e}")
-                
-                if data_received:
-                    self.data_updated.emit()
-                    
+                with self._buffer_lock:
+                    if len(self.time_buffer) > 0:
+                        last_time = self.time_buffer.last()
+                    else:
+                        last_time = 0
+
+                sample_times = last_time + time_elapsed * (
+                    np.arange(1, num_samples + 1, dtype=np.float64) / num_samples
+                )
+
+                # Samples arrive as little-endian 16-bit signed integers
+                values = np.frombuffer(data, dtype='<i2', count=num_samples)
+
+                # Add to buffers (block writes, no per-sample boxing)
+                with self._buffer_lock:
+                    self.eeg_buffer.extend(values)
+                    self.time_buffer.extend(sample_times)
+
+                # Save to file if recording (raw bytes are already
+                # little-endian int16, matching the .dat format)
+                if self.recording and self.output_file:
+                    self.output_file.write(data)
+                    # Push data to disk every couple of seconds so a
+                    # crash can't lose more than that
+                    if now_ns - self._last_flush > 2_000_000_000:
+                        self.output_file.flush()
+                        os.fsync(self.output_file.fileno())
+                        self._last_flush = now_ns
+
+                self._dirty = True
+
+
         except Exception as e:
             print(f"Error reading serial data: {e}")
             self.connection_changed.emit(False, f"Error reading data: {e}")
     
-    def get_data(self):
-        """Return the current data buffers"""
-        return list(self.eeg_buffer), list(self.time_buffer)
-    
+    def _maybe_emit(self):
+        """Emit data_updated if new samples arrived since the last tick"""
+        if self._dirty:
+            self._dirty = False
+            self.data_updated.emit()
+
     def get_connection_status(self):
         """Get the current connection status and information"""
         if not self.ser:
@@ -253,6 +349,7 @@ class SerialReader(QObject):
     
     def cleanup(self):
         """Clean up resources"""
+        self._stop_reader()
         if self.ser and self.ser.is_open:
             self.ser.close()
         if self.recording and self.output_file:
@@ -0,0 +1,140 @@
+"""
+Simulated data acquisition for EEG Monitor.
+Generates a synthetic EEG stream for development without hardware.
+"""
+
+import time
+import numpy as np
+from PyQt5.QtCore import QTimer
+
+from acquisition.data_source import DataSource
+
+class SimulatedReader(DataSource):
+    """Generates synthetic EEG data matching SerialReader's interface
+
+    The signal is a mixture of band-limited oscillations (alpha, beta,
+    theta) plus Gaussian noise and occasional large artifacts. Samples
+    are produced in whole blocks per timer tick - one vectorized numpy
+    evaluation per block rather than a Python call per sample.
+    """
+
+    def __init__(self, settings, data_manager=None):
+        super().__init__(settings, data_manager)
+
+        # Oscillation mixture: alpha (10 Hz), beta (20 Hz), theta (6 Hz).
+        # Stored as ndarrays with the angular frequencies precomputed so
+        # the block generator doesn't rebuild them every tick.
+        self.simulation_freq = np.array([10.0, 20.0, 6.0])
+        self.simulation_amp = np.array([40.0, 15.0, 20.0])
+        self._two_pi_f = (2 * np.pi * self.simulation_freq).reshape(-1, 1)
+        self.noise_level = 10.0       # uV std-dev of background noise
+        self.artifact_prob = 0.001    # Per-sample chance of a large artifact
+
+        # Modern Generator (PCG64) is several times faster per draw
+        # than the legacy np.random singleton
+        self._rng = np.random.default_rng()
+
+        # Sample clock
+        self.sample_counter = 0
+
+        # Generation timer (started on connect)
+        self._gen_timer = QTimer()
+        self._gen_timer.timeout.connect(self._generate_data)
+
+    def connect(self, port=None):
+        """Start generating simulated data"""
+        with self._buffer_lock:
+            self.eeg_buffer.clear()
+            self.time_buffer.clear()
+        self.sample_counter = 0
+        self.last_timestamp = time.monotonic_ns()
+        self.connected = True
+        self._gen_timer.start(self.settings.update_interval)
+        self.connection_changed.emit(True, "Connected to simulated EEG")
+        return True, "Connected to simulated EEG"
+
+    def disconnect(self):
+        """Stop generating simulated data"""
+        if self.connected:
+            if self.recording:
+                self.stop_recording()
+            self._gen_timer.stop()
+            self.connected = False
+            self.connection_changed.emit(False, "Disconnected from simulated EEG")
+            return True
+        return False
+
+    def _generate_block(self, n):
+        """Generate n samples of synthetic EEG in one vectorized pass
+
+        Args:
+            n: Number of samples to generate
+
+        Returns:
+            int16 numpy array of n samples
+        """
+        fs = self.settings.sampling_rate
+        t = (self.sample_counter + np.arange(n, dtype=np.float64)) / fs
+
+        # Sum of sinusoids: one matrix-vector product over all
+        # components, using the precomputed angular frequencies
+        sig = self.simulation_amp @ np.sin(self._two_pi_f * t[None, :])
+
+        # Background noise, drawn for the whole block at once
+        sig += self._rng.standard_normal(n) * self.noise_level
+
+        # Sparse large artifacts (blinks/movement); draw only as many
+        # spikes as actually fire rather than a full-length array
+        mask = self._rng.random(n) < self.artifact_prob
+        n_artifacts = int(mask.sum())
+        if n_artifacts:
+            sig[mask] += self._rng.standard_normal(n_artifacts) * 50.0
+
+        self.sample_counter += n
+        return np.clip(sig, -32768, 32767).astype(np.int16)
+
+    def _generate_data(self):
+        """Timer slot: generate the samples due since the last tick"""
+        now_ns = time.monotonic_ns()
+        time_elapsed = (now_ns - self.last_timestamp) * 1e-9
+        self.last_timestamp = now_ns
+
+        num_samples = int(time_elapsed * self.settings.sampling_rate)
+        if num_samples <= 0:
+            return
+
+        values = self._generate_block(num_samples)
+
+        if len(self.time_buffer) > 0:
+            last_time = self.time_buffer.last()
+        else:
+            last_time = 0
+        sample_times = last_time + time_elapsed * (
+            np.arange(1, num_samples + 1, dtype=np.float64) / num_samples
+        )
+
+        with self._buffer_lock:
+            self.eeg_buffer.extend(values)
+            self.time_buffer.extend(sample_times)
+
+        # Save to file if recording - one buffered write per tick, in
+        # the same little-endian int16 format SerialReader records.
+        # copy=False makes the astype a no-op on little-endian hosts,
+        # so the write is a single memcpy of the block.
+        if self.recording and self.output_file:
+            self.output_file.write(values.astype('<i2', copy=False).tobytes())
+
+        self.data_updated.emit()
+
+    def get_connection_status(self):
+        """Get the current connection status and information"""
+        if self.connected:
+            return True, "Active (simulated)"
+        return False, "Not connected"
+
+    def cleanup(self):
+        """Clean up resources"""
+        self._gen_timer.stop()
+        if self.recording and self.output_file:
+            self.output_file.close()
+        self.connected = False
@@ -14,6 +14,10 @@ class Settings:
         self.use_bluetooth = True   # Prioritize Bluetooth connections
         self.bluetooth_device_name = "404-BrainNotFound"  # Name of Bluetooth EEG device
         
+        # Data source: set True to run against the synthetic generator
+        # instead of real hardware
+        self.use_simulated_data = False
+
         # Sampling settings
         self.sampling_rate = 500  # Hz
         
@@ -3,6 +3,7 @@ Data management for EEG Monitor.
 Handles data storage, loading, and export.
 """
 
+import io
 import os
 import time
 import numpy as np
@@ -33,12 +34,15 @@ class DataManager:
     
     def prepare_recording_file(self):
         """Prepare a file for recording EEG data
-        
+
         Returns:
-            tuple of (file_object, filename)
+            tuple of (file_object, filename). The file is wrapped in a
+            large BufferedWriter so streaming sample blocks coalesce
+            into few write syscalls.
         """
         filename = self.generate_filename("EEG_RECORDING", ".dat")
-        file_obj = open(filename, 'wb')
+        raw = open(filename, 'wb', buffering=0)
+        file_obj = io.BufferedWriter(raw, buffer_size=64 * 1024)
         return file_obj, filename
     
     def save_metadata(self, recording_file, metadata):
@@ -70,22 +74,25 @@ class DataManager:
             tuple of (eeg_data, sample_rate, metadata) where eeg_data is a numpy array,
             sample_rate is an integer, and metadata is a dictionary
         """
-        # Load the raw data
-        with open(filename, 'rb') as f:
-            raw_data = f.read()
-        
-        # Convert bytes to 16-bit integers
-        eeg_data = np.frombuffer(raw_data, dtype=np.int16)
+        # Memory-map the raw data so pages are loaded on demand rather
+        # than copying the whole file into memory up front. The array is
+        # read-only; callers needing a mutable copy can np.array() it.
+        eeg_data = np.memmap(filename, dtype=np.int16, mode='r')
         
-        # Try to load metadata
-        metadata = {}
+        # Try to load metadata - read the whole file in one go and let a
+        # missing file raise rather than stat()ing first
         metadata_file = os.path.splitext(filename)[0] + "_meta.txt"
-        if os.path.exists(metadata_file):
+        try:
             with open(metadata_file, 'r') as f:
-                for line in f:
-                    if ':' in line:
-                        key, value = line.strip().split(':', 1)
-                        metadata[key.strip()] = value.strip()
+                text = f.read()
+        except FileNotFoundError:
+            text = ''
+        metadata = {
+            key.strip(): value.strip()
+            for key, sep, value in
+            (line.partition(':') for line in text.splitlines())
+            if sep
+        }
         
         # Get sample rate from metadata or default
         sample_rate = int(metadata.get('sample_rate', self.settings.sampling_rate))
@@ -106,12 +113,20 @@ class DataManager:
         """
         if filename is None:
             filename = self.generate_filename("EEG_EXPORT", ".csv")
-            
+
         try:
-            with open(filename, 'w') as f:
-                f.write("Time,EEG\n")
-                for t, eeg in zip(time_data, eeg_data):
-                    f.write(f"{t:.6f},{eeg}\n")
+            # One vectorized savetxt call instead of a formatted write
+            # per sample
+            t = np.asarray(time_data, dtype=np.float64)
+            e = np.asarray(eeg_data, dtype=np.int32)
+            np.savetxt(
+                filename,
+                np.column_stack((t, e)),
+                fmt=['%.6f', '%d'],
+                delimiter=',',
+                header='Time,EEG',
+                comments=''
+            )
             return True, f"Exported data to {filename}"
         except Exception as e:
             return False, f"Error exporting data: {e}"
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Fixed-size ring buffer for EEG Monitor.
+Stores streaming samples in a preallocated numpy array.
+"""
+
+import numpy as np
+
+class RingBuffer:
+    """Fixed-capacity circular buffer backed by a preallocated numpy array
+
+    Unlike a deque of Python objects, samples are stored unboxed in a
+    single contiguous array, so appending a block is a numpy slice
+    assignment and reading the contents back is at most two slice copies.
+    """
+
+    def __init__(self, size, dtype=np.float64):
+        """Initialize the ring buffer
+
+        Args:
+            size: Maximum number of samples to keep
+            dtype: numpy dtype used for storage
+        """
+        self.size = size
+        self._data = np.empty(size, dtype=dtype)
+        self._head = 0   # Next write position
+        self._count = 0  # Number of valid samples (<= size)
+        self.total_samples = 0  # Samples ever written (monotonic)
+
+    def __len__(self):
+        return self._count
+
+    def extend(self, values):
+        """Append a block of samples, overwriting the oldest on overflow
+
+        Args:
+            values: Array-like block of samples to append
+        """
+        values = np.asarray(values)
+        n = len(values)
+        if n == 0:
+            return
+        self.total_samples += n
+
+        # If the block alone overfills the buffer, keep only the tail
+        if n >= self.size:
+            self._data[:] = values[-self.size:]
+            self._head = 0
+            self._count = self.size
+            return
+
+        end = self._head + n
+        if end <= self.size:
+            self._data[self._head:end] = values
+        else:
+            # Wrap around: split the block at the end of the array
+            split = self.size - self._head
+            self._data[self._head:] = values[:split]
+            self._data[:n - split] = values[split:]
+
+        self._head = end % self.size
+        self._count = min(self._count + n, self.size)
+
+    def last(self):
+        """Return the most recently appended sample
+
+        Returns:
+            The newest sample, or None if the buffer is empty
+        """
+        if self._count == 0:
+            return None
+        return self._data[(self._head - 1) % self.size]
+
+    def to_array(self):
+        """Return the buffer contents in order, oldest first
+
+        Returns:
+            A numpy array of the valid samples. When the samples happen
+            to be in order this is a zero-copy view (never the storage
+            array itself, so callers can tell it apart from an owning
+            copy); otherwise it is a single concatenation of the two
+            wrapped slices.
+        """
+        if self._count < self.size or self._head == 0:
+            return self._data[:self._count]
+        return np.concatenate((self._data[self._head:], self._data[:self._head]))
+
+    def clear(self):
+        """Discard all samples"""
+        self._head = 0
+        self._count = 0
+        self.total_samples = 0
@@ -28,7 +28,11 @@ def main():
     
     # Load settings
     settings = Settings()
-    
+
+    # Run against the synthetic generator when requested
+    if '--simulate' in sys.argv:
+        settings.use_simulated_data = True
+
     # Create main window
     main_window = EEGMonitorWindow(settings)
     
@@ -44,6 +48,12 @@ def main():
 
 def auto_connect(window):
     """Automatically attempt to connect to EEG device after startup"""
+    # Simulated source needs no port scan
+    if window.settings.use_simulated_data:
+        success, message = window.serial_reader.connect()
+        print(message)
+        return
+
     # Get list of available ports
     ports = window.serial_reader.get_available_ports()
     
@@ -3,7 +3,8 @@ Signal processing filters for EEG Monitor.
 """
 
 import numpy as np
-from scipy.signal import butter, filtfilt, iirnotch, welch, spectrogram
+import scipy.fft
+from scipy.signal import butter, get_window, iirnotch, sosfiltfilt, tf2sos, welch
 
 class SignalProcessor:
     """Signal processing for EEG data"""
@@ -15,196 +16,388 @@ class SignalProcessor:
             settings: Application settings
         """
         self.settings = settings
+
+        # Designed filter coefficients, keyed on their design parameters.
+        # Filter design (polynomial root finding) costs milliseconds and
+        # the parameters only change when the user touches a control, so
+        # design once and reuse on every tick.
+        self._coeff_cache = {}
+
+        # Cached STFT columns for the incremental spectrogram path
+        self._spec_cache = None
+
+        # Scratch buffers for the dB image, reused while the shape
+        # holds. Two of them, used alternately: the image from the
+        # previous call may still be referenced by the display (which
+        # paints lazily), so each call writes into the buffer the
+        # display is no longer showing.
+        self._db_scratch = [None, None]
+        self._db_index = 0
     
     def apply_filters(self, eeg_data):
         """Apply filters to EEG data
-        
+
         Args:
             eeg_data: Raw EEG data array
-            
+
         Returns:
-            Filtered EEG data
+            Filtered EEG data. When no filtering applies this is the
+            input array itself (sosfiltfilt never mutates its input, so
+            no defensive copy is needed).
         """
-        # Convert to numpy array if it's not already
-        data = np.array(eeg_data)
-        
+        # Convert to numpy array if it's not already (no copy when the
+        # caller already hands us one)
+        data = np.asarray(eeg_data)
+
         # Check if we have enough data to filter
         if len(data) < 30:  # Minimum length to avoid filtfilt errors
             return data  # Return unfiltered data
-            
-        # Make a copy to avoid modifying the original data
-        filtered_data = data.copy()
-        
+
         # Only apply filters if enabled in settings
         if self.settings.filter_settings['enable_filter']:
-            # Apply highpass filter if frequency > 0
-            highpass = self.settings.filter_settings['highpass']
-            if highpass > 0:
-                b, a = self._butter_highpass(highpass, self.settings.sampling_rate)
+            sos = self._combined_sos()
+            if sos is not None:
                 try:
-                    filtered_data = filtfilt(b, a, filtered_data)
+                    # One forward-backward pass over the cascade of all
+                    # enabled stages, instead of three passes each
+                    # traversing the whole array twice
+                    return sosfiltfilt(sos, data)
                 except ValueError:
-                    # If filter fails, continue with unfiltered data for this step
+                    # If filter fails, fall through to unfiltered data
                     pass
-            
-            # Apply lowpass filter
-            lowpass = self.settings.filter_settings['lowpass']
-            if lowpass < self.settings.sampling_rate / 2:
-                b, a = self._butter_lowpass(lowpass, self.settings.sampling_rate)
-                try:
-                    filtered_data = filtfilt(b, a, filtered_data)
-                except ValueError:
-                    # If filter fails, continue with current data
-                    pass
-            
-            # Apply notch filter (for power line noise)
-            notch = self.settings.filter_settings['notch']
+
+        return data
+
+    def rebuild_coefficients(self):
+        """Design the filter cascade for the current settings now
+
+        All designs are cached lazily, so this only matters for timing:
+        calling it from the settings UI moves the design cost (a few ms
+        of polynomial root finding) off the next display tick.
+        """
+        self._combined_sos()
+
+    def _combined_sos(self):
+        """Build the combined SOS cascade for the current filter settings
+
+        Stacks the second-order sections of every enabled stage
+        (highpass, lowpass, notch) into one matrix so apply_filters can
+        run a single sosfiltfilt. Cached per parameter set.
+
+        Returns:
+            SOS array, or None when no stage is enabled
+        """
+        fs = self.settings.sampling_rate
+        highpass = self.settings.filter_settings['highpass']
+        lowpass = self.settings.filter_settings['lowpass']
+        notch = self.settings.filter_settings['notch']
+
+        key = ('cascade', highpass, lowpass, notch, fs)
+        if key not in self._coeff_cache:
+            stages = []
+            if highpass > 0:
+                stages.append(self._butter_highpass(highpass, fs))
+            if lowpass < fs / 2:
+                stages.append(self._butter_lowpass(lowpass, fs))
             if notch > 0:
-                b, a = self._iirnotch(notch, self.settings.sampling_rate)
-                try:
-                    filtered_data = filtfilt(b, a, filtered_data)
-                except ValueError:
-                    # If filter fails, continue with current data
-                    pass
-                
-        return filtered_data
+                stages.append(self._iirnotch(notch, fs))
+            self._coeff_cache[key] = np.vstack(stages) if stages else None
+        return self._coeff_cache[key]
     
     def _butter_highpass(self, cutoff, fs, order=4):
         """Design a highpass Butterworth filter
-        
+
         Args:
             cutoff: Cutoff frequency
             fs: Sampling frequency
             order: Filter order
-            
+
         Returns:
-            b, a: Filter coefficients
+            Filter coefficients as second-order sections
         """
-        nyq = 0.5 * fs
-        normal_cutoff = cutoff / nyq
-        b, a = butter(order, normal_cutoff, btype='high', analog=False)
-        return b, a
-    
+        key = ('high', cutoff, fs, order)
+        if key not in self._coeff_cache:
+            nyq = 0.5 * fs
+            normal_cutoff = cutoff / nyq
+            self._coeff_cache[key] = butter(order, normal_cutoff, btype='high',
+                                            analog=False, output='sos')
+        return self._coeff_cache[key]
+
     def _butter_lowpass(self, cutoff, fs, order=4):
         """Design a lowpass Butterworth filter
-        
+
         Args:
             cutoff: Cutoff frequency
             fs: Sampling frequency
             order: Filter order
-            
+
         Returns:
-            b, a: Filter coefficients
+            Filter coefficients as second-order sections
         """
-        nyq = 0.5 * fs
-        normal_cutoff = cutoff / nyq
-        b, a = butter(order, normal_cutoff, btype='low', analog=False)
-        return b, a
-        
+        key = ('low', cutoff, fs, order)
+        if key not in self._coeff_cache:
+            nyq = 0.5 * fs
+            normal_cutoff = cutoff / nyq
+            self._coeff_cache[key] = butter(order, normal_cutoff, btype='low',
+                                            analog=False, output='sos')
+        return self._coeff_cache[key]
+
     def _iirnotch(self, cutoff, fs, Q=30):
         """Design a notch filter
-        
+
         Args:
             cutoff: Cutoff frequency to remove
             fs: Sampling frequency
             Q: Quality factor
-            
+
         Returns:
-            b, a: Filter coefficients
+            Filter coefficients as second-order sections
         """
-        nyq = 0.5 * fs
-        normal_cutoff = cutoff / nyq
-        b, a = iirnotch(normal_cutoff, Q)
-        return b, a
+        key = ('notch', cutoff, fs, Q)
+        if key not in self._coeff_cache:
+            nyq = 0.5 * fs
+            normal_cutoff = cutoff / nyq
+            self._coeff_cache[key] = tf2sos(*iirnotch(normal_cutoff, Q))
+        return self._coeff_cache[key]
     
-    def calculate_spectrogram(self, eeg_data):
+    def _stft_power(self, data, window, scale, hop, nperseg, f_hi):
+        """Compute STFT power columns for a stretch of samples
+
+        Args:
+            data: Sample array covering the segments to transform
+            window: Analysis window array
+            scale: Density scaling factor for the window
+            hop: Samples between segment starts
+            nperseg: Segment length
+            f_hi: Number of frequency bins to keep (display band)
+
+        Returns:
+            Power array shaped (segments, f_hi), linear scale
+        """
+        # Batched STFT: all segments are processed as one 2D array
+        # (strided views, so no per-segment Python loop), equivalent
+        # to scipy.signal.spectrogram with detrend='constant' and
+        # scaling='density'.
+        frames = np.lib.stride_tricks.sliding_window_view(data, nperseg)[::hop]
+        frames = frames - frames.mean(axis=1, keepdims=True)
+        frames *= window
+
+        # scipy's pocketfft can split the segment batch across cores;
+        # workers=-1 uses them all (a no-op for single-segment batches)
+        X = scipy.fft.rfft(frames, axis=1, workers=-1)
+        power = X.real[:, :f_hi] ** 2 + X.imag[:, :f_hi] ** 2
+        power *= scale
+        # One-sided spectrum: double everything except DC (and Nyquist,
+        # when the display band reaches it)
+        last = -1 if (nperseg % 2 == 0 and f_hi == nperseg // 2 + 1) else None
+        power[:, 1:last] *= 2.0
+        return power
+
+    def _stft_columns_cached(self, data, total_samples, window, scale,
+                             hop, nperseg, f_hi, fs):
+        """Incrementally compute STFT columns anchored to absolute samples
+
+        Segments are aligned to the absolute sample grid (segment k
+        covers samples [k*hop, k*hop + nperseg)), so a column computed
+        once stays valid as the buffer slides and only segments that
+        newly fit need an FFT.
+
+        Args:
+            data: Current buffer snapshot
+            total_samples: Absolute index just past data's last sample
+            (remaining args as in _stft_power)
+
+        Returns:
+            tuple of (power, first_k, start) where power is shaped
+            (segments, f_hi), first_k is the absolute index of the first
+            segment and start of the first buffered sample; power is
+            None when no whole segment fits
+        """
+        n = len(data)
+        start = total_samples - n
+        k0 = -(-start // hop)  # First segment fully inside the buffer
+        k1 = (total_samples - nperseg) // hop  # Last one that fits
+        if k1 < k0:
+            return None, 0, start
+
+        # Cached columns were computed from filtered samples, so a
+        # filter change has to invalidate them
+        fset = self.settings.filter_settings
+        params = (fs, nperseg, f_hi, fset['enable_filter'],
+                  fset['highpass'], fset['lowpass'], fset['notch'])
+
+        cache = self._spec_cache
+        if (cache is not None
+                and cache['params'] == params
+                and cache['k0'] <= k0 <= cache['k1'] + 1
+                and k1 >= cache['k1']):
+            # Reuse the overlap, FFT only the newly arrived segments
+            kept = cache['power'][k0 - cache['k0']:]
+            first_new = cache['k1'] + 1
+            if first_new <= k1:
+                segment = data[first_new * hop - start:
+                               k1 * hop - start + nperseg]
+                new_power = self._stft_power(segment, window, scale,
+                                             hop, nperseg, f_hi)
+                power = np.concatenate((kept, new_power))
+            else:
+                power = kept
+        else:
+            # Cache is cold or misaligned - compute the whole range
+            segment = data[k0 * hop - start:k1 * hop - start + nperseg]
+            power = self._stft_power(segment, window, scale,
+                                     hop, nperseg, f_hi)
+
+        self._spec_cache = {
+            'params': params,
+            'k0': k0,
+            'k1': k1,
+            'power': power,
+        }
+        return power, k0, start
+
+    def calculate_spectrogram(self, eeg_data, total_samples=None):
         """Calculate spectrogram from EEG data
-        
+
         Args:
             eeg_data: EEG data array
-            
+            total_samples: Monotonic count of samples ever acquired
+                (i.e. the absolute index just past eeg_data's last
+                sample). When given, STFT columns are anchored to the
+                absolute sample grid and cached across calls, so each
+                update only transforms segments that arrived since the
+                previous one.
+
         Returns:
             freqs: Frequency values
             times: Time values
-            power: Power values
+            power: Power values in dB, laid out (time x freq) and
+                C-contiguous for direct display (one of two alternating
+                scratch buffers: valid through the next call, reused on
+                the one after)
             min_freq: Minimum frequency displayed
             max_freq: Maximum frequency displayed
         """
-        # Convert to numpy array if it's not already
-        data = np.array(eeg_data)
-        
-        # Check if we have enough data
-        if len(data) < self.settings.sampling_rate:
-            return None, None, None, None, None
-        
+        # Convert to numpy array if it's not already. Single precision
+        # is plenty for a displayed dB image, and float32 halves the
+        # bytes moved through the FFT while letting pocketfft use its
+        # single-precision kernels.
+        data = np.asarray(eeg_data)
+        if data.dtype != np.float32:
+            data = data.astype(np.float32)
+
         # Calculate spectrogram
         fs = self.settings.sampling_rate
         nperseg = int(fs * 2)  # 2-second segments
         noverlap = nperseg // 2  # 50% overlap
-        
+        hop = nperseg - noverlap
+
+        # Check if we have enough data for at least one segment
+        if len(data) < nperseg:
+            return None, None, None, None, None
+
+        # Build the analysis window once per (fs, nperseg)
+        key = ('spec_window', fs, nperseg)
+        if key not in self._coeff_cache:
+            window = get_window('hann', nperseg)
+            # One-sided density scaling, precomputed with the window.
+            # The window is stored float32 so it doesn't upcast the
+            # float32 frames when applied.
+            scale = 1.0 / (fs * np.sum(window ** 2))
+            self._coeff_cache[key] = (window.astype(np.float32), scale)
+        window, scale = self._coeff_cache[key]
+
+        # Set frequency range
+        min_freq = 0
+        max_freq = 70  # Only show up to 70 Hz
+
+        # The frequency grid is fixed for a given (fs, nperseg), so
+        # compute it - and the index of the 70 Hz cutoff - once
+        fkey = ('spec_freqs', fs, nperseg, max_freq)
+        if fkey not in self._coeff_cache:
+            all_freqs = np.fft.rfftfreq(nperseg, d=1.0 / fs)
+            f_hi = int(np.searchsorted(all_freqs, max_freq, side='right'))
+            self._coeff_cache[fkey] = (all_freqs[:f_hi], f_hi)
+        freqs, f_hi = self._coeff_cache[fkey]
+
         try:
-            freqs, times, Sxx = spectrogram(
-                data, 
-                fs=fs, 
-                window='hanning',
-                nperseg=nperseg,
-                noverlap=noverlap,
-                detrend='constant',
-                scaling='density'
-            )
-            
-            # Convert to dB scale (log scale is better for visualization)
-            # Add small value to avoid log(0)
-            Sxx_db = 10 * np.log10(Sxx + 1e-10)
-            
-            # Set frequency range
-            min_freq = 0
-            max_freq = 70  # Only show up to 70 Hz
-            
+            if total_samples is not None:
+                power, first_k, start = self._stft_columns_cached(
+                    data, total_samples, window, scale, hop, nperseg, f_hi, fs
+                )
+                if power is None:
+                    return None, None, None, None, None
+                times = (np.arange(first_k, first_k + len(power)) * hop
+                         + nperseg / 2 - start) / fs
+            else:
+                power = self._stft_power(data, window, scale, hop, nperseg, f_hi)
+                times = (np.arange(len(power)) * hop + nperseg / 2) / fs
+
+            # Convert to dB scale (log scale is better for visualization).
+            # The cached linear power must not be mutated, so the result
+            # goes into a scratch buffer reused across updates once the
+            # image shape settles (single precision: plenty for an 8-bit
+            # colour map, half the bytes). The two scratches alternate
+            # so the previous call's image stays intact while this one
+            # is computed. The (time x freq) layout matches what
+            # ImageItem wants, so the plot can blit it without
+            # materializing a transpose.
+            self._db_index = 1 - self._db_index
+            Sxx_db = self._db_scratch[self._db_index]
+            if Sxx_db is None or Sxx_db.shape != power.shape:
+                Sxx_db = np.empty(power.shape, dtype=np.float32)
+                self._db_scratch[self._db_index] = Sxx_db
+            np.add(power, 1e-10, out=Sxx_db)
+            np.log10(Sxx_db, out=Sxx_db)
+            Sxx_db *= 10
+
             return freqs, times, Sxx_db, min_freq, max_freq
-            
+
         except Exception as e:
             print(f"Error calculating spectrogram: {e}")
             return None, None, None, None, None
             
+    # Clinical band edges are contiguous, so one sorted edge array
+    # partitions the spectrum for all bands at once
+    _BAND_NAMES = ('delta', 'theta', 'alpha', 'beta', 'gamma')
+    _BAND_EDGES = np.array([0.5, 4.0, 8.0, 13.0, 30.0, 70.0])
+
     def calculate_bands(self, eeg_data):
         """Calculate power in different frequency bands
-        
+
         Args:
             eeg_data: EEG data array
-            
+
         Returns:
             Dictionary with band powers
         """
-        # Define frequency bands
-        bands = {
-            'delta': (0.5, 4),
-            'theta': (4, 8),
-            'alpha': (8, 13),
-            'beta': (13, 30),
-            'gamma': (30, 70)
-        }
-        
         # Calculate power spectrum using Welch's method
         fs = self.settings.sampling_rate
-        
+
         # Check if we have enough data
         if len(eeg_data) < fs * 2:
-            return {band: 0 for band in bands}
-            
+            return {band: 0 for band in self._BAND_NAMES}
+
         try:
-            freqs, psd = welch(eeg_data, fs, nperseg=fs*2)
-            
-            # Calculate power in each band
-            band_powers = {}
-            for band, (low, high) in bands.items():
-                # Find indices of frequencies in the band
-                idx_band = np.logical_and(freqs >= low, freqs <= high)
-                # Calculate mean power in the band
-                band_powers[band] = np.mean(psd[idx_band])
-                
-            return band_powers
-            
+            # Let welch's segment FFTs use all cores too
+            with scipy.fft.set_workers(-1):
+                freqs, psd = welch(eeg_data, fs, nperseg=fs*2)
+
+            # Integrate all bands in a single pass: reduceat sums each
+            # [edge, next-edge) run of bins instead of five masked
+            # traversals of the full spectrum. The bin boundaries only
+            # depend on the frequency grid, so they're cached.
+            bkey = ('band_bins', fs, len(freqs))
+            if bkey not in self._coeff_cache:
+                self._coeff_cache[bkey] = np.searchsorted(freqs, self._BAND_EDGES)
+            bins = self._coeff_cache[bkey]
+
+            sums = np.add.reduceat(psd, bins)[:len(self._BAND_NAMES)]
+            counts = np.diff(bins)
+            means = sums / counts
+
+            return dict(zip(self._BAND_NAMES, means))
+
         except Exception as e:
             print(f"Error calculating band powers: {e}")
-            return {band: 0 for band in bands}
\ No newline at end of file
+            return {band: 0 for band in self._BAND_NAMES}
\ No newline at end of file
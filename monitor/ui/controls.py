@@ -6,7 +6,7 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
     QSlider, QComboBox, QDialog, QDialogButtonBox
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 
 class ControlPanel(QWidget):
     """Control panel widget with all user controls"""
@@ -15,15 +15,39 @@ class ControlPanel(QWidget):
     filter_changed = pyqtSignal()  # Signal emitted when filter settings change
     display_changed = pyqtSignal()  # Signal emitted when display settings change
     
-    def __init__(self, settings, serial_reader, signal_processor, data_manager):
+    def __init__(self, settings, serial_reader, signal_processor, data_manager,
+                 spectrogram_plot=None):
         super().__init__()
-        
+
         self.settings = settings
         self.serial_reader = serial_reader
         self.signal_processor = signal_processor
         self.data_manager = data_manager
-        
+        self.spectrogram_plot = spectrogram_plot
+
+        # Last (connected, message) shown, so repeat notifications
+        # don't reapply identical label styles
+        self._last_conn_state = None
+
+        # Debounce timers for the change signals: dragging the
+        # sensitivity slider or scrolling a combo box fires a change
+        # per step, and each emission rebuilds plot markers and ranges.
+        # The settings dicts are still updated immediately; only the
+        # expensive redraw signal waits for the interaction to settle.
+        self._filter_debounce = QTimer(self)
+        self._filter_debounce.setSingleShot(True)
+        self._filter_debounce.setInterval(80)
+        self._filter_debounce.timeout.connect(self.filter_changed)
+
+        self._display_debounce = QTimer(self)
+        self._display_debounce.setSingleShot(True)
+        self._display_debounce.setInterval(80)
+        self._display_debounce.timeout.connect(self.display_changed)
+
         self.init_ui()
+
+        if self.spectrogram_plot is not None:
+            self.spectrogram_plot.export_finished.connect(self.on_spectrogram_saved)
     
     def init_ui(self):
         """Initialize user interface components"""
@@ -75,10 +99,13 @@ class ControlPanel(QWidget):
         controls_layout2 = QHBoxLayout()
         main_layout.addLayout(controls_layout2)
         
-        # Add filter controls
+        # Add filter controls. Each combo has a parallel list mapping
+        # item index to its numeric value (None meaning "Off"), so the
+        # change handler is a lookup rather than text parsing.
         controls_layout2.addWidget(QLabel("Highpass:"))
         self.highpass_combo = QComboBox()
         self.highpass_combo.addItems(["Off", "0.1 Hz", "0.5 Hz", "1.0 Hz", "5.0 Hz"])
+        self._highpass_values = [None, 0.1, 0.5, 1.0, 5.0]
         self.highpass_combo.setCurrentIndex(2)  # Default 0.5 Hz
         self.highpass_combo.currentIndexChanged.connect(self.update_filter_settings)
         controls_layout2.addWidget(self.highpass_combo)
@@ -86,6 +113,7 @@ class ControlPanel(QWidget):
         controls_layout2.addWidget(QLabel("Lowpass:"))
         self.lowpass_combo = QComboBox()
         self.lowpass_combo.addItems(["30 Hz", "50 Hz", "70 Hz", "100 Hz", "Off"])
+        self._lowpass_values = [30.0, 50.0, 70.0, 100.0, None]
         self.lowpass_combo.setCurrentIndex(2)  # Default 70 Hz
         self.lowpass_combo.currentIndexChanged.connect(self.update_filter_settings)
         controls_layout2.addWidget(self.lowpass_combo)
@@ -93,6 +121,7 @@ class ControlPanel(QWidget):
         controls_layout2.addWidget(QLabel("Notch:"))
         self.notch_combo = QComboBox()
         self.notch_combo.addItems(["Off", "50 Hz", "60 Hz"])
+        self._notch_values = [None, 50.0, 60.0]
         self.notch_combo.setCurrentIndex(2)  # Default 60 Hz (US)
         self.notch_combo.currentIndexChanged.connect(self.update_filter_settings)
         controls_layout2.addWidget(self.notch_combo)
@@ -118,6 +147,12 @@ class ControlPanel(QWidget):
     
     def update_connection_status(self, connected, message=None):
         """Update the connection status display"""
+        # Reapplying an identical state would still recompute the label
+        # stylesheets, so skip no-op updates
+        if (connected, message) == self._last_conn_state:
+            return
+        self._last_conn_state = (connected, message)
+
         if connected:
             self.connection_label.setText(f"Connection: {message}")
             self.connection_label.setStyleSheet("color: green")
@@ -151,6 +186,10 @@ class ControlPanel(QWidget):
         
         if dialog.exec_() == QDialog.Accepted:
             selected_port = combo.currentData()
+            if selected_port is None:
+                # No ports to offer (e.g. simulated source)
+                self.status_label.setText("Status: No ports available")
+                return
             self.port_button.setText(selected_port)
             # Not connecting yet, wait for user to press Connect
             self.status_label.setText(f"Selected port: {selected_port}. Press Connect to use.")
@@ -181,45 +220,55 @@ class ControlPanel(QWidget):
         self.status_label.setText(f"Status: {message}")
     
     def save_spectrogram(self):
-        """Save a spectrogram of the current data"""
-        # Get the data
-        eeg_data, _ = self.serial_reader.get_data()
-        
-        # Apply filters
-        filtered_data = self.signal_processor.apply_filters(eeg_data)
-        
-        # Save the spectrogram
-        success, message = self.signal_processor.save_spectrogram(filtered_data)
-        self.status_label.setText(f"Status: {message}")
+        """Save the currently displayed spectrogram to an image file"""
+        if self.spectrogram_plot is None:
+            self.status_label.setText("Status: No spectrogram to save")
+            return
+
+        # Export the already-rendered plot rather than recomputing the
+        # spectrogram for the file; the disk write completes in the
+        # background and on_spectrogram_saved reports the result
+        filename = self.data_manager.generate_filename("EEG_SPECTROGRAM", ".png")
+        try:
+            self.spectrogram_plot.export_image(filename)
+            self.status_label.setText("Status: Saving spectrogram...")
+        except Exception as e:
+            self.status_label.setText(f"Status: Error saving spectrogram: {e}")
+
+    def on_spectrogram_saved(self, success, filename):
+        """Handle completion of a background spectrogram export"""
+        if success:
+            self.status_label.setText(f"Status: Saved spectrogram to {filename}")
+        else:
+            self.status_label.setText(f"Status: Error saving spectrogram to {filename}")
     
     def update_filter_settings(self):
         """Update filter settings from the UI controls"""
-        # Get filter values from dropdown menus
-        highpass_text = self.highpass_combo.currentText()
-        if highpass_text == "Off":
-            self.settings.filter_settings['highpass'] = 0
-        else:
-            self.settings.filter_settings['highpass'] = float(highpass_text.split()[0])
-        
-        lowpass_text = self.lowpass_combo.currentText()
-        if lowpass_text == "Off":
-            self.settings.filter_settings['lowpass'] = self.settings.sampling_rate / 2
-        else:
-            self.settings.filter_settings['lowpass'] = float(lowpass_text.split()[0])
-        
-        notch_text = self.notch_combo.currentText()
-        if notch_text == "Off":
-            self.settings.filter_settings['notch'] = 0
-        else:
-            self.settings.filter_settings['notch'] = float(notch_text.split()[0])
-        
+        # Look up filter values by combo index - no text parsing
+        highpass = self._highpass_values[self.highpass_combo.currentIndex()]
+        self.settings.filter_settings['highpass'] = highpass if highpass else 0
+
+        lowpass = self._lowpass_values[self.lowpass_combo.currentIndex()]
+        if lowpass is None:
+            lowpass = self.settings.sampling_rate / 2
+        self.settings.filter_settings['lowpass'] = lowpass
+
+        notch = self._notch_values[self.notch_combo.currentIndex()]
+        self.settings.filter_settings['notch'] = notch if notch else 0
+
+        # Design the new cascade immediately so the cost lands here,
+        # not on the next display tick
+        self.signal_processor.rebuild_coefficients()
+
         # Update status label
         self.status_label.setText(
-            f"Filters updated: HP {highpass_text}, LP {lowpass_text}, Notch {notch_text}"
+            f"Filters updated: HP {self.highpass_combo.currentText()}, "
+            f"LP {self.lowpass_combo.currentText()}, "
+            f"Notch {self.notch_combo.currentText()}"
         )
-        
-        # Emit signal to update plots
-        self.filter_changed.emit()
+
+        # Signal the plots once the interaction settles
+        self._filter_debounce.start()
     
     def update_sensitivity(self):
         """Update sensitivity setting from slider"""
@@ -230,9 +279,9 @@ class ControlPanel(QWidget):
         self.status_label.setText(
             f"Sensitivity: {self.settings.display_settings['sensitivity']:.1f}x"
         )
-        
-        # Emit signal to update plots
-        self.display_changed.emit()
+
+        # Signal the plots once the interaction settles
+        self._display_debounce.start()
     
     def update_display_speed(self):
         """Update display speed setting"""
@@ -248,6 +297,6 @@ class ControlPanel(QWidget):
         self.status_label.setText(
             f"Display speed: {speed} mm/s, Duration: {self.settings.display_duration:.1f} s"
         )
-        
-        # Emit signal to update plots
-        self.display_changed.emit()
\ No newline at end of file
+
+        # Signal the plots once the interaction settles
+        self._display_debounce.start()
\ No newline at end of file
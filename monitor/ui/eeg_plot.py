@@ -6,6 +6,23 @@ import numpy as np
 import pyqtgraph as pg
 from PyQt5.QtCore import Qt
 
+# pyqtgraph can build curve geometry (arrayToQPath) with
+# numba-compiled loops; enable that path when numba happens to be
+# installed, without making it a requirement
+try:
+    import numba  # noqa: F401
+    pg.setConfigOptions(useNumba=True)
+except ImportError:
+    pass
+
+# Likewise route line rendering through the GPU when PyOpenGL is
+# available; the software QPainterPath renderer is the fallback
+try:
+    import OpenGL  # noqa: F401
+    pg.setConfigOptions(useOpenGL=True)
+except ImportError:
+    pass
+
 class EEGPlot(pg.GraphicsLayoutWidget):
     """Widget for displaying real-time EEG waveform"""
     
@@ -13,6 +30,18 @@ class EEGPlot(pg.GraphicsLayoutWidget):
         super().__init__()
         
         self.settings = settings
+
+        # Scratch array reused by update_plot so each refresh writes
+        # the normalized time axis into the same storage instead of
+        # allocating a fresh one
+        self._x_scratch = None
+
+        # Marker line pools: the InfiniteLine items are created once
+        # and repositioned on settings changes instead of being torn
+        # out of the scene and rebuilt
+        self._h_lines = []
+        self._v_lines = []
+
         self.init_plot()
     
     def init_plot(self):
@@ -26,8 +55,16 @@ class EEGPlot(pg.GraphicsLayoutWidget):
         # Add grid lines to EEG plot (resembling EEG paper)
         self.plot.showGrid(x=True, y=True, alpha=0.3)
         
-        # Create scrolling line for EEG
-        self.curve = self.plot.plot(pen=(255, 255, 0))
+        # Create scrolling line for EEG. The trace has thousands of
+        # samples but only ~1000 horizontal pixels, so let pyqtgraph
+        # peak-decimate to the viewport before stroking, and skip
+        # points outside the visible range entirely.
+        self.curve = self.plot.plot(
+            pen=(255, 255, 0),
+            autoDownsample=True,
+            downsampleMethod='peak',
+            clipToView=True
+        )
         
         # Add amplitude markers (μV divisions)
         self.add_amplitude_markers()
@@ -45,38 +82,42 @@ class EEGPlot(pg.GraphicsLayoutWidget):
         self.plot.setXRange(0, self.settings.display_duration)
     
     def add_amplitude_markers(self):
-        """Add horizontal lines marking amplitude divisions"""
-        # Clear existing horizontal lines
-        for item in list(self.plot.items):
-            if isinstance(item, pg.InfiniteLine) and item.angle == 0:
-                self.plot.removeItem(item)
-        
-        # Add amplitude markers (μV divisions)
+        """Position horizontal lines marking amplitude divisions"""
+        # Amplitude markers (μV divisions); the lines are created on
+        # first use and only repositioned afterwards
         scale = self.settings.display_settings['scale']
-        for i in range(-5, 6):
-            if i == 0:
-                # Thicker line for zero
-                hLine = pg.InfiniteLine(pos=i*scale, angle=0, 
-                                      pen=pg.mkPen('w', width=1))
-            else:
-                hLine = pg.InfiniteLine(pos=i*scale, angle=0, 
-                                      pen=pg.mkPen('w', width=0.5, style=Qt.DashLine))
-            self.plot.addItem(hLine)
-    
+        for idx, i in enumerate(range(-5, 6)):
+            if idx >= len(self._h_lines):
+                if i == 0:
+                    # Thicker line for zero
+                    pen = pg.mkPen('w', width=1)
+                else:
+                    pen = pg.mkPen('w', width=0.5, style=Qt.DashLine)
+                line = pg.InfiniteLine(angle=0, pen=pen)
+                self.plot.addItem(line)
+                self._h_lines.append(line)
+            self._h_lines[idx].setValue(i * scale)
+
     def add_time_markers(self):
-        """Add vertical lines marking time divisions"""
-        # Clear existing vertical lines
-        for item in list(self.plot.items):
-            if isinstance(item, pg.InfiniteLine) and item.angle == 90:
-                self.plot.removeItem(item)
-        
-        # Add new time markers every second or half-second depending on display duration
+        """Position vertical lines marking time divisions"""
+        # Time markers every second or half-second depending on display
+        # duration; pooled lines are repositioned and spares hidden
         display_duration = self.settings.display_duration
         marker_interval = 0.5 if display_duration <= 5 else 1
-        
-        for i in np.arange(marker_interval, display_duration, marker_interval):
-            vLine = pg.InfiniteLine(pos=i, angle=90, pen=pg.mkPen('w', width=0.5, style=Qt.DashLine))
-            self.plot.addItem(vLine)
+
+        # A plain integer loop: a handful of marker positions isn't
+        # worth an ndarray plus per-element numpy-scalar boxing
+        count = int(np.ceil(display_duration / marker_interval)) - 1
+        for idx in range(count):
+            if idx >= len(self._v_lines):
+                line = pg.InfiniteLine(
+                    angle=90, pen=pg.mkPen('w', width=0.5, style=Qt.DashLine))
+                self.plot.addItem(line)
+                self._v_lines.append(line)
+            self._v_lines[idx].setValue((idx + 1) * marker_interval)
+            self._v_lines[idx].setVisible(True)
+        for line in self._v_lines[count:]:
+            line.setVisible(False)
     
     def update_display_settings(self):
         """Update display when settings change"""
@@ -103,9 +144,10 @@ class EEGPlot(pg.GraphicsLayoutWidget):
         if len(time_data) < 2 or len(eeg_data) < 2:
             return
             
-        # Convert to numpy arrays if they aren't already
-        times = np.array(time_data)
-        values = np.array(eeg_data)
+        # The reader already hands us numpy arrays; asarray avoids
+        # re-copying them every update
+        times = np.asarray(time_data)
+        values = np.asarray(eeg_data)
         
         # Check if we received any data
         if len(times) == 0:
@@ -120,13 +162,23 @@ class EEGPlot(pg.GraphicsLayoutWidget):
         # Calculate the start time for our display window
         window_start = most_recent_time - display_duration
         
-        # Filter data to only show what's in our display window
-        mask = times >= window_start
-        display_times = times[mask]
-        display_values = values[mask]
-        
-        # Normalize times to display window
-        normalized_times = display_times - window_start
-        
-        # Update the curve
-        self.curve.setData(normalized_times, display_values)
\ No newline at end of file
+        # Timestamps are monotonic, so the display window starts at a
+        # single binary search instead of a full-buffer boolean mask;
+        # the values slice is a zero-copy view
+        i = int(np.searchsorted(times, window_start, side='left'))
+        n = len(times) - i
+        if n < 2:
+            return
+        if self._x_scratch is None or len(self._x_scratch) < len(times):
+            self._x_scratch = np.empty(len(times))
+
+        # Normalize times to display window, written into the scratch
+        display_times = self._x_scratch[:n]
+        np.subtract(times[i:], window_start, out=display_times)
+
+        # Update the curve. Samples come from 16-bit integers through
+        # IIR filtering, so they are always finite - skipFiniteCheck
+        # with connect='all' drops pyqtgraph's per-frame isfinite scan
+        # over the whole trace.
+        self.curve.setData(display_times, values[i:],
+                           connect='all', skipFiniteCheck=True)
\ No newline at end of file
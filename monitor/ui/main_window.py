@@ -4,6 +4,7 @@ Main window for the EEG Monitor application.
 
 import sys
 import os
+import time
 from pathlib import Path
 
 # Get the absolute path to the project directory and ui directory
@@ -17,18 +18,52 @@ if ui_dir not in sys.path:
     sys.path.insert(0, ui_dir)
 
 from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout
-from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
 
 # Import directly using absolute paths
 from ui.eeg_plot import EEGPlot
 from ui.spectrogram_plot import SpectrogramPlot
 from ui.controls import ControlPanel
 from acquisition.serial_reader import SerialReader
+from acquisition.simulated_reader import SimulatedReader
 from signal_processing.filters import SignalProcessor
 from data.data_manager import DataManager
 
+class SpectrogramWorker(QObject):
+    """Runs the spectrogram filter/STFT pipeline on a worker thread
+
+    The computation is triggered by a queued signal carrying a buffer
+    snapshot and reports back the same way, so the GUI thread never
+    blocks on the FFT work.
+    """
+
+    # Computed spectrogram: freqs, times, power, min_freq, max_freq
+    result_ready = pyqtSignal(object, object, object, object, object)
+
+    def __init__(self, signal_processor):
+        super().__init__()
+        self.signal_processor = signal_processor
+
+    def compute(self, eeg_data, total_samples):
+        """Filter the snapshot and compute its spectrogram
+
+        Args:
+            eeg_data: Buffer snapshot (owned by this call)
+            total_samples: Absolute sample count for column caching
+        """
+        filtered_data = self.signal_processor.apply_filters(eeg_data)
+        freqs, times, power, min_freq, max_freq = \
+            self.signal_processor.calculate_spectrogram(
+                filtered_data, total_samples=total_samples)
+        # Always report back (freqs may be None) so the window's
+        # in-flight flag is released even when there was nothing to show
+        self.result_ready.emit(freqs, times, power, min_freq, max_freq)
+
 class EEGMonitorWindow(QMainWindow):
     """Main window for the EEG Monitor application"""
+
+    # Request signal for the spectrogram worker (queued across threads)
+    _spec_requested = pyqtSignal(object, int)
     
     def __init__(self, settings):
         super().__init__()
@@ -47,17 +82,39 @@ class EEGMonitorWindow(QMainWindow):
     
     def setup_components(self):
         """Initialize application components"""
-        # Data acquisition
-        self.serial_reader = SerialReader(self.settings)
-        
-        # Signal processing
-        self.signal_processor = SignalProcessor(self.settings)
-        
         # Data management
         self.data_manager = DataManager(self.settings)
-        
-        # Connect signals
-        self.serial_reader.data_updated.connect(self.update_plots)
+
+        # Data acquisition (records through the data manager). Both
+        # sources share the DataSource interface, so the rest of the
+        # window doesn't care which one is behind self.serial_reader.
+        if self.settings.use_simulated_data:
+            self.serial_reader = SimulatedReader(self.settings, self.data_manager)
+        else:
+            self.serial_reader = SerialReader(self.settings, self.data_manager)
+
+        # Signal processing
+        self.signal_processor = SignalProcessor(self.settings)
+
+        # Last filtered buffer, keyed on (sample count, filter version)
+        # so repeated redraws of unchanged data skip the filter pass
+        self._filter_cache = None
+        self._filter_version = 0
+
+        # Spectrogram computation runs on its own thread so the FFT
+        # work can't stall painting or input handling
+        self._spec_thread = QThread(self)
+        self._spec_worker = SpectrogramWorker(self.signal_processor)
+        self._spec_worker.moveToThread(self._spec_thread)
+        self._spec_requested.connect(self._spec_worker.compute)
+        self._spec_worker.result_ready.connect(self.handle_spectrogram_result)
+        self._spec_busy = False
+        self._spec_thread.start()
+
+        # Connect signals. data_updated is already coalesced by the
+        # reader to at most one emission per display interval, so it
+        # drives the trace directly.
+        self.serial_reader.data_updated.connect(self.update_eeg_display)
         self.serial_reader.connection_changed.connect(self.handle_connection_change)
     
     def init_ui(self):
@@ -77,14 +134,15 @@ class EEGMonitorWindow(QMainWindow):
         
         # Create control panel
         self.control_panel = ControlPanel(
-            self.settings, 
+            self.settings,
             self.serial_reader,
             self.signal_processor,
-            self.data_manager
+            self.data_manager,
+            spectrogram_plot=self.spectrogram_plot
         )
         
         # Connect control panel signals
-        self.control_panel.filter_changed.connect(self.update_plots)
+        self.control_panel.filter_changed.connect(self.handle_filter_change)
         self.control_panel.display_changed.connect(self.handle_display_change)
         
         # Add widgets to layout
@@ -95,68 +153,113 @@ class EEGMonitorWindow(QMainWindow):
     # Rest of your code remains the same
     def setup_timers(self):
         """Set up periodic update timers"""
-        # Timer for updating the EEG display
+        # One timer drives both displays: the EEG trace every tick, the
+        # spectrogram every Nth tick. A single Qt event source halves
+        # the timer dispatch overhead and keeps the two updates from
+        # interleaving.
+        self._tick = 0
+        self._last_display_ts = 0.0
+        self._last_spec_samples = -1
+        self._spec_ticks = max(
+            1, self.settings.spectrogram_update // self.settings.update_interval)
         self.display_timer = QTimer(self)
-        self.display_timer.timeout.connect(self.update_eeg_display)
+        self.display_timer.timeout.connect(self.update_displays)
         self.display_timer.start(self.settings.update_interval)
-        
-        # Timer for updating the spectrogram
-        self.spec_timer = QTimer(self)
-        self.spec_timer.timeout.connect(self.update_spectrogram)
-        self.spec_timer.start(self.settings.spectrogram_update)
-        
-        # Timer for checking connection status
-        self.conn_timer = QTimer(self)
-        self.conn_timer.timeout.connect(self.check_connection)
-        self.conn_timer.start(5000)  # Check connection every 5 seconds
-    
-    def update_plots(self):
-        """Signal handler for when new data is available"""
-        # Just trigger the display update
+
+    def update_displays(self):
+        """Timer slot: update the EEG trace and, periodically, the spectrogram"""
+        # The trace is normally redrawn by data_updated; only fall back
+        # to a timer-driven redraw when no data-driven one happened
+        # within the last interval (e.g. filter changes while idle)
+        if (time.monotonic() - self._last_display_ts
+                >= self.settings.update_interval / 1000.0):
+            self.update_eeg_display()
+        self._tick += 1
+        if self._tick % self._spec_ticks == 0:
+            self.update_spectrogram()
+
+    def handle_filter_change(self):
+        """Handle changes to the filter settings"""
+        # Invalidate the memoized filtered buffer, then redraw with the
+        # new settings
+        self._filter_version += 1
         self.update_eeg_display()
-        
+        # The spectrogram skips updates while no data arrives, but a
+        # filter change makes the current image stale regardless - drop
+        # the skip marker and recompute now
+        self._last_spec_samples = -1
+        self.update_spectrogram()
+
+    def _get_filtered(self, eeg_data, total_samples):
+        """Return the filtered buffer, reusing the last result when the
+        data and filter settings are unchanged
+
+        Args:
+            eeg_data: Buffer snapshot from the reader
+            total_samples: Monotonic sample count identifying the data
+
+        Returns:
+            Filtered EEG data array
+        """
+        key = (total_samples, len(eeg_data), self._filter_version)
+        if self._filter_cache is not None and self._filter_cache[0] == key:
+            return self._filter_cache[1]
+        filtered = self.signal_processor.apply_filters(eeg_data)
+        self._filter_cache = (key, filtered)
+        return filtered
+
     def update_eeg_display(self):
         """Update the EEG plot with the latest data"""
-        # Get the data from the serial reader
-        eeg_data, time_data = self.serial_reader.get_data()
-        
+        self._last_display_ts = time.monotonic()
+
+        # Get the data from the serial reader (the sample count comes
+        # from the same lock acquisition, so it matches the snapshot)
+        eeg_data, time_data, total_samples = self.serial_reader.get_data()
+
         if len(eeg_data) < 10:
             return
-            
-        # Apply filters
-        filtered_data = self.signal_processor.apply_filters(eeg_data)
-        
+
+        # Apply filters (memoized while the buffer is unchanged)
+        filtered_data = self._get_filtered(eeg_data, total_samples)
+
         # Scale the data by sensitivity
         scaled_data = filtered_data * self.settings.display_settings['sensitivity']
-        
+
         # Update the plot
         self.eeg_plot.update_plot(time_data, scaled_data)
     
     def update_spectrogram(self):
-        """Update the spectrogram plot"""
-        # Get the data from the serial reader
-        eeg_data, _ = self.serial_reader.get_data()
-        
+        """Hand the latest data to the spectrogram worker"""
+        # Don't queue a second computation while one is in flight
+        if self._spec_busy:
+            return
+
+        # Get the data from the serial reader (a detached snapshot, so
+        # the worker can process it while acquisition continues). The
+        # sample count comes from the same lock acquisition: the cached
+        # STFT columns are anchored on it, so it must describe exactly
+        # this snapshot.
+        eeg_data, _, total_samples = self.serial_reader.get_data()
+
+        # Nothing arrived since the last update: the image would be
+        # identical, so skip the filter/STFT/repaint entirely
+        if total_samples == self._last_spec_samples:
+            return
+        self._last_spec_samples = total_samples
+
         if len(eeg_data) < self.settings.sampling_rate:
             return
-            
-        # Apply filters
-        filtered_data = self.signal_processor.apply_filters(eeg_data)
-        
-        # Calculate spectrogram
-        freqs, times, power, min_freq, max_freq = self.signal_processor.calculate_spectrogram(filtered_data)
-        
+
+        self._spec_busy = True
+        self._spec_requested.emit(eeg_data, total_samples)
+
+    def handle_spectrogram_result(self, freqs, times, power, min_freq, max_freq):
+        """Display a spectrogram computed by the worker thread"""
+        self._spec_busy = False
         if freqs is None:
             return
-            
-        # Update the plot
         self.spectrogram_plot.update_plot(freqs, times, power, min_freq, max_freq)
-    
-    def check_connection(self):
-        """Check and update the connection status"""
-        status, message = self.serial_reader.get_connection_status()
-        self.control_panel.update_connection_status(status, message)
-    
+
     def handle_connection_change(self, connected, message):
         """Handle connection status changes"""
         self.control_panel.update_connection_status(connected, message)
@@ -175,4 +278,7 @@ class EEGMonitorWindow(QMainWindow):
         # Clean up resources
         if hasattr(self, 'serial_reader'):
             self.serial_reader.disconnect()
+        if hasattr(self, '_spec_thread'):
+            self._spec_thread.quit()
+            self._spec_thread.wait(1000)
         super().closeEvent(event)
\ No newline at end of file
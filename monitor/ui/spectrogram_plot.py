@@ -2,11 +2,34 @@
 Spectrogram plot for the EEG Monitor application.
 """
 
+import numpy as np
 import pyqtgraph as pg
-from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtCore import Qt, QRectF, QRunnable, QThreadPool, pyqtSignal
+
+class _ImageSaveTask(QRunnable):
+    """Writes an already-rendered image to disk off the GUI thread
+
+    Rendering has to happen on the GUI thread, but encoding and
+    writing the PNG doesn't - this runnable takes the finished QImage
+    so the event loop isn't stalled on disk I/O.
+    """
+
+    def __init__(self, image, filename, owner):
+        super().__init__()
+        self._image = image
+        self._filename = filename
+        self._owner = owner
+
+    def run(self):
+        ok = self._image.save(self._filename)
+        # Cross-thread emit is delivered queued on the GUI thread
+        self._owner.export_finished.emit(ok, self._filename)
 
 class SpectrogramPlot(pg.GraphicsLayoutWidget):
     """Widget for displaying real-time EEG spectrogram"""
+
+    # Result of a background image export: success flag, filename
+    export_finished = pyqtSignal(bool, str)
     
     def __init__(self, settings):
         super().__init__()
@@ -30,36 +53,69 @@ class SpectrogramPlot(pg.GraphicsLayoutWidget):
         self.colorbar = pg.ColorBarItem(values=(0, 50), colorMap='viridis')
         self.colorbar.setImageItem(self.img)
         
+        # Smoothed colour levels, seeded on the first update
+        self._levels = None
+        self._applied_levels = None
+
+        # Last axis extent pushed to the image/view, so unchanged
+        # geometry doesn't trigger scene invalidations every tick
+        self._extent = None
+
         # Add frequency band markers and labels
         self.add_frequency_bands()
     
     def add_frequency_bands(self):
-        """Add frequency band indicators to the plot"""
+        """Add frequency band indicators to the plot
+
+        Lines and labels are created once here; update_plot only
+        repositions the labels when the displayed duration changes.
+        """
         # Define frequency ranges and labels
         freq_ranges = [
-            (0.5, 4, 'Delta'),
-            (4, 8, 'Theta'),
-            (8, 13, 'Alpha'),
-            (13, 30, 'Beta'),
-            (30, 70, 'Gamma')
+            (0.5, 4, 'δ Delta'),
+            (4, 8, 'θ Theta'),
+            (8, 13, 'α Alpha'),
+            (13, 30, 'β Beta'),
+            (30, 70, 'γ Gamma')
         ]
-        
-        # Add horizontal lines marking frequency bands
+
+        # Add horizontal lines marking frequency bands, and keep the
+        # labels so they can follow the time axis as it grows
+        self._band_texts = []
         for low, high, band in freq_ranges:
             # Add a line at each boundary
             line = pg.InfiniteLine(pos=low, angle=0, pen=pg.mkPen('w', width=0.5, style=Qt.DashLine))
             self.plot.addItem(line)
-            
+
             # Add a label for the band (in the middle of its range)
             mid = (low + high) / 2
             text = pg.TextItem(text=band, color=(255, 255, 255, 150), anchor=(0, 0.5))
             text.setPos(0, mid)
             self.plot.addItem(text)
-        
+            self._band_texts.append((text, mid))
+
         # Add a line at the top boundary of the highest band
         line = pg.InfiniteLine(pos=70, angle=0, pen=pg.mkPen('w', width=0.5, style=Qt.DashLine))
         self.plot.addItem(line)
     
+    def export_image(self, filename):
+        """Save the current spectrogram view to an image file
+
+        Exports the already-rendered plot item directly, so saving
+        costs one render of the existing scene rather than recomputing
+        and re-plotting the spectrogram in a separate library. The
+        render happens here on the GUI thread; the file write runs on
+        the global thread pool and export_finished reports the result.
+
+        Args:
+            filename: Output image path (extension selects the format)
+        """
+        from pyqtgraph.exporters import ImageExporter
+        exporter = ImageExporter(self.plot)
+        exporter.parameters()['width'] = 1200
+        image = exporter.export(toBytes=True)
+        QThreadPool.globalInstance().start(_ImageSaveTask(image, filename, self))
+
     def update_display_settings(self):
         """Update display when settings change"""
         # No specific settings to update for spectrogram currently
@@ -71,43 +127,50 @@ class SpectrogramPlot(pg.GraphicsLayoutWidget):
         Args:
             freqs: Array of frequency values
             times: Array of time values
-            power: 2D array of power values (freq x time)
+            power: 2D array of power values (time x freq), contiguous
+                and ready for ImageItem
             min_freq: Minimum frequency to display
             max_freq: Maximum frequency to display
         """
         if power is None or len(times) == 0:
             return
-            
-        # Transpose the image data to correctly align frequency and time
-        # This ensures frequencies are plotted on the Y axis and time on the X axis
-        power_transposed = power.T
-        
-        # Update the image
-        self.img.setImage(power_transposed)
-        
-        # Set the correct scale for x and y axes
+
+        # Update colorbar range first so the image below renders with
+        # levels already in place. Robust percentiles instead of
+        # min/max so a single artifact doesn't wash out the colour map,
+        # smoothed across updates so the levels don't flicker every
+        # tick.
+        lo, hi = np.percentile(power, (2, 98))
+        if self._levels is None:
+            self._levels = (lo, hi)
+        else:
+            self._levels = (0.9 * self._levels[0] + 0.1 * lo,
+                            0.9 * self._levels[1] + 0.1 * hi)
+        # Repaint the colour scale only on a visible change (>0.5 dB)
+        if (self._applied_levels is None
+                or abs(self._levels[0] - self._applied_levels[0]) > 0.5
+                or abs(self._levels[1] - self._applied_levels[1]) > 0.5):
+            self._applied_levels = self._levels
+            self.colorbar.setLevels(self._levels)
+
+        # Update the image. The worker already delivers it in display
+        # orientation (time on x, frequency on y); autoLevels=False
+        # skips the per-frame min/max scan since the smoothed levels
+        # above are authoritative.
+        self.img.setImage(power, autoLevels=False)
+
+        # Set the scale for x and y axes, but only when the extent
+        # actually moved - once the buffer is full the duration is
+        # constant and re-applying it would invalidate the scene for
+        # nothing
         duration = times[-1]  # Duration of the analyzed window in seconds
-        self.img.setRect(QRectF(0, min_freq, duration, max_freq - min_freq))
-        
-        # Set axes limits explicitly to ensure proper scaling
-        self.plot.setXRange(0, duration)
-        self.plot.setYRange(min_freq, max_freq)
-        
-        # Update colorbar range
-        self.colorbar.setLevels((power.min(), power.max()))
-        
-        # Make sure Greek letters and frequency band labels are visible
-        if not hasattr(self, 'freq_bands_added'):
-            self.freq_bands_added = True
-            band_labels = [
-                (4, "δ Delta"),
-                (8, "θ Theta"),
-                (13, "α Alpha"),
-                (30, "β Beta"),
-                (70, "γ Gamma")
-            ]
-            
-            for freq, label in band_labels:
-                text_item = pg.TextItem(text=label, color=(255, 255, 255), anchor=(0, 0.5))
-                text_item.setPos(duration * 0.02, freq)
-                self.plot.addItem(text_item)
\ No newline at end of file
+        extent = (duration, min_freq, max_freq)
+        if extent != self._extent:
+            self._extent = extent
+            self.img.setRect(QRectF(0, min_freq, duration, max_freq - min_freq))
+            self.plot.setXRange(0, duration)
+            self.plot.setYRange(min_freq, max_freq)
+            # Nudge the band labels (created at init) in from the left
+            # edge of the new extent
+            for text, mid in self._band_texts:
+                text.setPos(duration * 0.02, mid)
\ No newline at end of file